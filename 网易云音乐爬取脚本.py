@@ -1,61 +1,219 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
+import tkinter.font as tkfont
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from typing import Dict, List
 import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import logging
+import logging.handlers
+import atexit
+import queue
 import os
+import secrets
 import webbrowser
 
+# JSON 编解码：优先使用 orjson，未安装时回退到标准库 json
+try:
+    import orjson
+
+    def _jloads(data):
+        """解析JSON（支持 bytes/str）"""
+        return orjson.loads(data)
+
+    def _jdumps(obj, pretty: bool = False) -> bytes:
+        """序列化为UTF-8编码的JSON字节串"""
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+except ImportError:
+    def _jloads(data):
+        """解析JSON（支持 bytes/str）"""
+        return json.loads(data)
+
+    def _jdumps(obj, pretty: bool = False) -> bytes:
+        """序列化为UTF-8编码的JSON字节串"""
+        return json.dumps(obj, ensure_ascii=False, indent=2 if pretty else None).encode('utf-8')
+
+class CachedTimeFormatter(logging.Formatter):
+    """同一秒内复用已格式化时间的日志格式器"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_sec = None
+        self._cached_str = ""
+    
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        if sec != self._cached_sec:
+            self._cached_sec = sec
+            self._cached_str = time.strftime(datefmt or '%Y-%m-%d %H:%M:%S', self.converter(sec))
+        return self._cached_str
+
 # 设置日志
 def setup_logging():
-    """设置日志系统"""
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-    
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        handlers=[
-            logging.FileHandler(f'logs/netease_search_download_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log', encoding='utf-8'),
-            logging.StreamHandler()
-        ]
+    """设置日志系统（日志记录经队列交给后台线程写入，调用方不阻塞在磁盘IO上）"""
+    os.makedirs('logs', exist_ok=True)
+    
+    formatter = CachedTimeFormatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
     )
-    return logging.getLogger(__name__)
+    file_handler = logging.FileHandler(f'logs/netease_search_download_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log', encoding='utf-8')
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.DEBUG)
+    root_logger.addHandler(queue_handler)
+    
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    listener.start()
+    return logging.getLogger(__name__), listener
+
+logger, log_listener = setup_logging()
+
+def stop_logging():
+    """停止日志后台线程，写完队列中剩余的日志"""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
 
-logger = setup_logging()
+atexit.register(stop_logging)
+
+@dataclass(slots=True)
+class SongInfo:
+    """歌曲信息"""
+    song_id: int
+    name: str
+    artists: List[str]
+    artist_ids: List[str]
+    artist_str: str
+    album_id: int
+    album_name: str
+    duration: str
+    duration_ms: int
+    publish_time: str
+    download_link: str
 
 class NeteaseSearchDownload:
     """网易云音乐搜索下载工具"""
     
+    # 文件名非法字符替换表（Windows文件名中不允许的字符及控制字符）
+    _FN_TRANS = str.maketrans({c: '_' for c in '<>:"/\\|?*' + ''.join(map(chr, range(32)))})
+    _FN_MAX_BYTES = 200  # 文件名（不含扩展名）UTF-8 编码后的最大字节数，为重名后缀和 .mp3.part 留出余量
+    
+    # 搜索结果列及列宽
+    _COLUMNS = ("序号", "歌曲ID", "歌曲名", "歌手", "专辑", "时长", "专辑ID", "歌手ID")
+    _COL_WIDTHS = (50, 80, 200, 150, 150, 70, 80, 80)
+    
+    # HTTP连接池大小（批量下载并发数不超过此值）
+    _POOL_MAXSIZE = 32
+    
+    # 下载写入参数：每次读取 1 MiB，文件写缓冲 2 MiB
+    _COPY_CHUNK_SIZE = 1024 * 1024
+    _WRITE_BUFFER_SIZE = 2 * 1024 * 1024
+    
+    # 日志文本框最多保留的行数
+    _MAX_LOG_LINES = 2000
+    
     def __init__(self):
         self.base_url = "https://163api.qijieya.cn/search"
         
+        # HTTP会话：复用连接池，避免每次请求重新握手
+        self.session = self.create_session()
+        
+        # 下载链接HEAD结果缓存：{歌曲ID: (状态码, 最终URL, 大小, 类型, 时间)}
+        self._head_cache = {}
+        self._head_cache_ttl = 60  # 秒
+        
         # 搜索状态
         self.current_keywords = ""
         self.current_offset = 0
         self.current_limit = 20
         self.current_result = None
-        self.song_details = []  # 存储详细的歌曲信息
+        self.song_details: List[SongInfo] = []  # 存储详细的歌曲信息
+        self._raw_songs = []  # 与 song_details 一一对应的原始歌曲数据
+        
+        # 是否有搜索正在进行（防止重复提交）
+        self._search_inflight = False
+        
+        # 搜索结果缓存（LRU）：{(关键词, 偏移量, 每页数量): 结果}
+        self._search_cache = OrderedDict()
+        self._search_cache_size = 32
+        
+        # 原始数据延迟渲染（仅在切换到"原始数据"标签页时格式化）
+        self._last_raw = None
+        self._raw_dirty = False
         
         # 当前选中的歌曲
         self.selected_song = None
+        self._pending_detail_idx = None  # 等待刷新详情的歌曲索引
+        
+        # 日志文本框写入缓冲（空闲时合并写入，减少Tk调用）
+        self._text_buffers = {}
+        self._text_lock = threading.Lock()
+        
+        # 时间戳格式化缓存：{格式: (秒, 格式化结果)}
+        self._timestamp_cache = {}
+        
+        # 后台线程的界面更新队列，由主线程定时批量处理
+        self._ui_queue = queue.Queue()
         
         # 歌曲命名设置 (新增)
         self.naming_format = "歌曲名-歌手"  # 默认格式
         
         # 下载位置设置 (新增)
         self.download_dir = "downloads"  # 默认下载位置
+        
+        # 批量下载并发数
+        self.batch_concurrency = 4
+        self._save_job = None  # 延迟保存设置的定时任务
         self.load_settings()  # 加载设置
+        try:
+            os.makedirs(self.download_dir, exist_ok=True)
+        except OSError as e:
+            # 下载目录不可用（如移动硬盘未连接）时仍允许启动，可在"下载位置"中重新设置
+            logger.warning(f"创建下载目录失败: {self.download_dir} ({e})")
+        
+        # 断点续传记录：{歌曲ID: {完整路径, 临时文件路径, ETag, Last-Modified}}
+        self._resume_file = "download_resume.json"
+        self._resume_lock = threading.Lock()
+        self._resume_index = self.load_resume_index()
+        self.cleanup_partial_downloads()
         
         # 创建主窗口
         self.root = tk.Tk()
         self.root.title("🎵 网易云音乐搜索下载工具")
         self.root.geometry("1100x800")
         
+        # 共享字体对象，避免每个控件重复解析字体
+        self.fonts = {
+            'title': tkfont.Font(family="Microsoft YaHei", size=14, weight="bold"),
+            'heading': tkfont.Font(family="Microsoft YaHei", size=12),
+            'label': tkfont.Font(family="Microsoft YaHei", size=11),
+            'label_bold': tkfont.Font(family="Microsoft YaHei", size=11, weight="bold"),
+            'body': tkfont.Font(family="Microsoft YaHei", size=10),
+            'small': tkfont.Font(family="Microsoft YaHei", size=9),
+            'mono': tkfont.Font(family="Consolas", size=9)
+        }
+        
         # 创建菜单
         self.create_menu()
         
@@ -65,35 +223,95 @@ class NeteaseSearchDownload:
         # 绑定事件
         self.bind_events()
         
+        # 启动界面更新队列的处理
+        self.root.after(100, self._drain_ui_queue)
+        
+        # 常驻搜索线程：队列只保留最新的一次搜索请求
+        self._search_q = queue.Queue(maxsize=1)
+        threading.Thread(target=self._search_worker, daemon=True).start()
+        
         logger.info("程序启动 - 搜索下载版")
     
+    @property
+    def download_dir(self) -> str:
+        """下载目录"""
+        return self._download_dir
+    
+    @download_dir.setter
+    def download_dir(self, value: str):
+        self._download_dir = value
+        self._download_dir_abs = os.path.abspath(value)  # 缓存绝对路径
+    
+    def create_session(self) -> requests.Session:
+        """创建带连接池和重试的HTTP会话"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=self._POOL_MAXSIZE,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "User-Agent": "Mozilla/5.0",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive"
+        })
+        return session
+    
     def load_settings(self):
         """加载设置"""
         try:
-            if os.path.exists("settings.json"):
-                with open("settings.json", "r", encoding="utf-8") as f:
-                    settings = json.load(f)
-                    self.naming_format = settings.get("naming_format", "歌曲名-歌手")
-                    self.download_dir = settings.get("download_dir", "downloads")
+            with open("settings.json", "rb") as f:
+                settings = _jloads(f.read())
+            self.naming_format = settings.get("naming_format", "歌曲名-歌手")
+            self.download_dir = settings.get("download_dir", "downloads")
+            # 并发数单独解析，取值非法时只回退该项，不影响其他设置
+            try:
+                concurrency = int(settings.get("batch_concurrency", 4))
+            except (TypeError, ValueError):
+                logger.warning(f"并发数设置无效，使用默认值: {settings.get('batch_concurrency')!r}")
+                concurrency = 4
+            self.batch_concurrency = min(max(concurrency, 1), self._POOL_MAXSIZE)
+        except FileNotFoundError:
+            # 首次运行，使用默认设置
+            pass
         except Exception as e:
             logger.warning(f"加载设置失败: {e}")
             # 使用默认设置
             self.naming_format = "歌曲名-歌手"
             self.download_dir = "downloads"
+            self.batch_concurrency = 4
     
     def save_settings(self):
         """保存设置"""
         try:
             settings = {
                 "naming_format": self.naming_format,
-                "download_dir": self.download_dir
+                "download_dir": self.download_dir,
+                "batch_concurrency": self.batch_concurrency
             }
-            with open("settings.json", "w", encoding="utf-8") as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
+            # 先写临时文件再替换，避免写入中断时损坏设置文件
+            with open("settings.json.tmp", "wb") as f:
+                f.write(_jdumps(settings, pretty=True))
+            os.replace("settings.json.tmp", "settings.json")
             logger.info("设置已保存")
         except Exception as e:
             logger.error(f"保存设置失败: {e}")
     
+    def _schedule_save(self):
+        """延迟500ms保存设置，连续修改只写一次文件"""
+        if self._save_job:
+            self.root.after_cancel(self._save_job)
+        self._save_job = self.root.after(500, self._flush_settings)
+    
+    def _flush_settings(self):
+        """立即保存尚未写入的设置"""
+        if self._save_job:
+            self.root.after_cancel(self._save_job)
+            self._save_job = None
+        self.save_settings()
+    
     def create_menu(self):
         """创建菜单栏"""
         menubar = tk.Menu(self.root)
@@ -139,7 +357,7 @@ class NeteaseSearchDownload:
         title_label = ttk.Label(
             main_frame, 
             text="🎵 网易云音乐搜索下载工具",
-            font=('微软雅黑', 14, 'bold')
+            font=self.fonts['title']
         )
         title_label.grid(row=0, column=0, columnspan=2, pady=(0, 5))
         
@@ -228,7 +446,7 @@ class NeteaseSearchDownload:
         self.download_status_label = ttk.Label(
             status_frame,
             text="未选择歌曲",
-            font=('微软雅黑', 9)
+            font=self.fonts['small']
         )
         self.download_status_label.pack(side=tk.LEFT, padx=(5, 10))
         
@@ -236,7 +454,7 @@ class NeteaseSearchDownload:
         self.download_location_label = ttk.Label(
             status_frame,
             text=f"下载位置: {self.download_dir}",
-            font=('微软雅黑', 9),
+            font=self.fonts['small'],
             foreground="blue"
         )
         self.download_location_label.pack(side=tk.LEFT, padx=(10, 0))
@@ -259,7 +477,7 @@ class NeteaseSearchDownload:
         self.page_label = ttk.Label(
             page_frame,
             text="偏移量: 0 | 总数: 0",
-            font=('微软雅黑', 10)
+            font=self.fonts['body']
         )
         self.page_label.pack(side=tk.LEFT, padx=10)
         
@@ -297,7 +515,7 @@ class NeteaseSearchDownload:
         self.reset_btn.pack(side=tk.LEFT)
         
         # 创建Notebook（标签页）- 修复空隙问题
-        notebook = ttk.Notebook(main_frame)
+        self.notebook = notebook = ttk.Notebook(main_frame)
         notebook.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 5))
         
         # 搜索结果标签页
@@ -307,29 +525,17 @@ class NeteaseSearchDownload:
         result_frame.rowconfigure(0, weight=1)
         
         # 歌曲列表树状视图
-        columns = ("序号", "歌曲ID", "歌曲名", "歌手", "专辑", "时长", "专辑ID", "歌手ID")
         self.tree = ttk.Treeview(
             result_frame,
-            columns=columns,
+            columns=self._COLUMNS,
             show="headings",
             selectmode="browse"
         )
         
         # 设置列
-        column_widths = {
-            "序号": 50,
-            "歌曲ID": 80,
-            "歌曲名": 200,
-            "歌手": 150,
-            "专辑": 150,
-            "时长": 70,
-            "专辑ID": 80,
-            "歌手ID": 80
-        }
-        
-        for col in columns:
+        for col, width in zip(self._COLUMNS, self._COL_WIDTHS):
             self.tree.heading(col, text=col)
-            self.tree.column(col, width=column_widths[col])
+            self.tree.column(col, width=width)
         
         # 滚动条
         tree_scrollbar = ttk.Scrollbar(result_frame, orient=tk.VERTICAL, command=self.tree.yview)
@@ -346,57 +552,57 @@ class NeteaseSearchDownload:
         detail_frame.columnconfigure(3, weight=1)
         
         # 歌曲详情显示
-        ttk.Label(detail_frame, text="歌曲名:", font=('微软雅黑', 11)).grid(
+        ttk.Label(detail_frame, text="歌曲名:", font=self.fonts['label']).grid(
             row=0, column=0, sticky=tk.W, pady=5, padx=5
         )
-        self.detail_name = ttk.Label(detail_frame, text="", font=('微软雅黑', 11, 'bold'))
+        self.detail_name = ttk.Label(detail_frame, text="", font=self.fonts['label_bold'])
         self.detail_name.grid(row=0, column=1, sticky=tk.W, pady=5, padx=5)
         
-        ttk.Label(detail_frame, text="歌曲ID:", font=('微软雅黑', 11)).grid(
+        ttk.Label(detail_frame, text="歌曲ID:", font=self.fonts['label']).grid(
             row=1, column=0, sticky=tk.W, pady=5, padx=5
         )
-        self.detail_song_id = ttk.Label(detail_frame, text="", font=('微软雅黑', 11))
+        self.detail_song_id = ttk.Label(detail_frame, text="", font=self.fonts['label'])
         self.detail_song_id.grid(row=1, column=1, sticky=tk.W, pady=5, padx=5)
         
-        ttk.Label(detail_frame, text="歌手:", font=('微软雅黑', 11)).grid(
+        ttk.Label(detail_frame, text="歌手:", font=self.fonts['label']).grid(
             row=2, column=0, sticky=tk.W, pady=5, padx=5
         )
         self.detail_artists = ttk.Label(detail_frame, text="")
         self.detail_artists.grid(row=2, column=1, sticky=tk.W, pady=5, padx=5)
         
-        ttk.Label(detail_frame, text="专辑:", font=('微软雅黑', 11)).grid(
+        ttk.Label(detail_frame, text="专辑:", font=self.fonts['label']).grid(
             row=3, column=0, sticky=tk.W, pady=5, padx=5
         )
         self.detail_album = ttk.Label(detail_frame, text="")
         self.detail_album.grid(row=3, column=1, sticky=tk.W, pady=5, padx=5)
         
         # 右侧信息
-        ttk.Label(detail_frame, text="专辑ID:", font=('微软雅黑', 11)).grid(
+        ttk.Label(detail_frame, text="专辑ID:", font=self.fonts['label']).grid(
             row=0, column=2, sticky=tk.W, pady=5, padx=(20, 5)
         )
         self.detail_album_id = ttk.Label(detail_frame, text="")
         self.detail_album_id.grid(row=0, column=3, sticky=tk.W, pady=5, padx=5)
         
-        ttk.Label(detail_frame, text="歌手ID:", font=('微软雅黑', 11)).grid(
+        ttk.Label(detail_frame, text="歌手ID:", font=self.fonts['label']).grid(
             row=1, column=2, sticky=tk.W, pady=5, padx=(20, 5)
         )
         self.detail_artist_ids = ttk.Label(detail_frame, text="")
         self.detail_artist_ids.grid(row=1, column=3, sticky=tk.W, pady=5, padx=5)
         
-        ttk.Label(detail_frame, text="时长:", font=('微软雅黑', 11)).grid(
+        ttk.Label(detail_frame, text="时长:", font=self.fonts['label']).grid(
             row=2, column=2, sticky=tk.W, pady=5, padx=(20, 5)
         )
         self.detail_duration = ttk.Label(detail_frame, text="")
         self.detail_duration.grid(row=2, column=3, sticky=tk.W, pady=5, padx=5)
         
-        ttk.Label(detail_frame, text="发布时间:", font=('微软雅黑', 11)).grid(
+        ttk.Label(detail_frame, text="发布时间:", font=self.fonts['label']).grid(
             row=3, column=2, sticky=tk.W, pady=5, padx=(20, 5)
         )
         self.detail_publish = ttk.Label(detail_frame, text="")
         self.detail_publish.grid(row=3, column=3, sticky=tk.W, pady=5, padx=5)
         
         # 下载信息
-        ttk.Label(detail_frame, text="下载链接:", font=('微软雅黑', 11)).grid(
+        ttk.Label(detail_frame, text="下载链接:", font=self.fonts['label']).grid(
             row=4, column=0, sticky=tk.W, pady=10, padx=5
         )
         self.detail_download_link = tk.Text(
@@ -404,19 +610,19 @@ class NeteaseSearchDownload:
             height=2,
             width=60,
             wrap=tk.WORD,
-            font=('Consolas', 9)
+            font=self.fonts['mono']
         )
         self.detail_download_link.grid(row=4, column=1, columnspan=3, sticky=tk.W, pady=10, padx=5)
         
         # 下载测试结果
-        ttk.Label(detail_frame, text="下载状态:", font=('微软雅黑', 11)).grid(
+        ttk.Label(detail_frame, text="下载状态:", font=self.fonts['label']).grid(
             row=5, column=0, sticky=tk.W, pady=5, padx=5
         )
-        self.detail_download_status = ttk.Label(detail_frame, text="", font=('微软雅黑', 10))
+        self.detail_download_status = ttk.Label(detail_frame, text="", font=self.fonts['body'])
         self.detail_download_status.grid(row=5, column=1, columnspan=3, sticky=tk.W, pady=5, padx=5)
         
         # 原始数据标签页
-        raw_frame = ttk.Frame(notebook)
+        self.raw_frame = raw_frame = ttk.Frame(notebook)
         notebook.add(raw_frame, text="原始数据")
         raw_frame.columnconfigure(0, weight=1)
         raw_frame.rowconfigure(0, weight=1)
@@ -425,9 +631,10 @@ class NeteaseSearchDownload:
         self.raw_text = scrolledtext.ScrolledText(
             raw_frame,
             wrap=tk.WORD,
-            font=('Consolas', 9),
+            font=self.fonts['mono'],
             width=80,
-            height=20
+            height=20,
+            state="disabled"  # 只读，写入时临时启用
         )
         self.raw_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5, pady=5)
         
@@ -441,9 +648,10 @@ class NeteaseSearchDownload:
         self.download_log_text = scrolledtext.ScrolledText(
             download_log_frame,
             wrap=tk.WORD,
-            font=('Consolas', 9),
+            font=self.fonts['mono'],
             width=80,
-            height=20
+            height=20,
+            state="disabled"  # 只读，写入时临时启用
         )
         self.download_log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5, pady=5)
         
@@ -457,9 +665,10 @@ class NeteaseSearchDownload:
         self.log_text = scrolledtext.ScrolledText(
             log_frame,
             wrap=tk.WORD,
-            font=('Consolas', 9),
+            font=self.fonts['mono'],
             width=80,
-            height=20
+            height=20,
+            state="disabled"  # 只读，写入时临时启用
         )
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5, pady=5)
         
@@ -479,16 +688,16 @@ class NeteaseSearchDownload:
         """绑定事件"""
         self.root.bind('<Return>', lambda e: self.on_search())
         self.tree.bind('<<TreeviewSelect>>', self.on_song_selected)
+        self.notebook.bind('<<NotebookTabChanged>>', lambda e: self.refresh_raw_data())
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
     def log(self, message: str, level: str = "INFO"):
         """记录日志"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = self.format_timestamp("%H:%M:%S")
         log_entry = f"[{timestamp}] [{level}] {message}"
         
         if self.log_text:
-            self.log_text.insert(tk.END, log_entry + "\n")
-            self.log_text.see(tk.END)
+            self.append_text(self.log_text, log_entry + "\n")
         
         if level == "DEBUG":
             logger.debug(message)
@@ -503,16 +712,72 @@ class NeteaseSearchDownload:
         if level == "INFO":
             self.status_label.config(text=message)
     
+    def _drain_ui_queue(self):
+        """批量处理后台线程提交的界面更新（每100ms一次）"""
+        status = None
+        for _ in range(64):
+            try:
+                kind, payload = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'log':
+                self.add_download_log(payload)
+            elif kind == 'status':
+                status = payload  # 状态栏只需显示最新的一条
+        
+        if status is not None:
+            self.status_label.config(text=status)
+        
+        self.root.after(100, self._drain_ui_queue)
+    
     def add_download_log(self, message: str):
         """添加下载记录"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = self.format_timestamp("%Y-%m-%d %H:%M:%S")
         log_entry = f"[{timestamp}] {message}"
         
         if self.download_log_text:
-            self.download_log_text.insert(tk.END, log_entry + "\n")
-            self.download_log_text.see(tk.END)
+            self.append_text(self.download_log_text, log_entry + "\n")
+    
+    def format_timestamp(self, fmt: str) -> str:
+        """格式化当前时间，同一秒内复用上次的结果"""
+        now = int(time.time())
+        cached = self._timestamp_cache.get(fmt)
+        if cached and cached[0] == now:
+            return cached[1]
+        
+        text = time.strftime(fmt, time.localtime(now))
+        self._timestamp_cache[fmt] = (now, text)
+        return text
+    
+    def append_text(self, widget, text: str):
+        """缓冲待追加到文本框的内容，在空闲时一次性写入"""
+        with self._text_lock:
+            pending = self._text_buffers.get(widget)
+            if pending is not None:
+                pending.append(text)
+                return
+            self._text_buffers[widget] = [text]
+        self.root.after_idle(self._flush_text, widget)
+    
+    def _flush_text(self, widget):
+        """将缓冲的内容写入文本框"""
+        with self._text_lock:
+            pending = self._text_buffers.pop(widget, None)
+        if not pending:
+            return
+        
+        widget.configure(state="normal")
+        widget.insert(tk.END, ''.join(pending))
+        
+        # 超出行数上限时一次性删除最早的内容，避免文本框无限增长
+        line_count = int(widget.index('end-1c').split('.')[0])
+        if line_count > self._MAX_LOG_LINES:
+            widget.delete('1.0', f'{line_count - self._MAX_LOG_LINES + 1}.0')
+        widget.configure(state="disabled")
+        widget.see(tk.END)
     
-    def search_music(self, keywords: str, offset: str = "0", limit: str = "20") -> Dict:
+    def search_music(self, keywords: str, offset: int = 0, limit: int = 20) -> Dict:
         """搜索音乐"""
         try:
             url = f"{self.base_url}?keywords={keywords}&offset={offset}&limit={limit}&type=1"
@@ -520,26 +785,31 @@ class NeteaseSearchDownload:
             self.log(f"开始搜索: '{keywords}' (offset={offset}, limit={limit})")
             self.log(f"请求URL: {url}", "DEBUG")
             
-            response = requests.get(url, timeout=30)
+            response = self.session.get(url, timeout=30)
             self.log(f"响应状态: {response.status_code}", "DEBUG")
             
             response.raise_for_status()
             
-            data = response.json()
-            
-            # 显示原始数据
-            raw_json = json.dumps(data, ensure_ascii=False, indent=2)
-            self.raw_text.delete(1.0, tk.END)
-            self.raw_text.insert(tk.END, raw_json)
-            
-            return data
+            return _jloads(response.content)
             
         except Exception as e:
             self.log(f"搜索失败: {e}", "ERROR")
             messagebox.showerror("搜索失败", f"搜索过程中发生错误:\n{str(e)}")
             return None
     
-    def extract_song_info(self, song: Dict) -> Dict:
+    def refresh_raw_data(self):
+        """原始数据标签页可见时渲染最新的搜索结果"""
+        if not self._raw_dirty or self.notebook.select() != str(self.raw_frame):
+            return
+        
+        self.raw_text.configure(state="normal")
+        self.raw_text.delete(1.0, tk.END)
+        if self._last_raw is not None:
+            self.raw_text.insert(tk.END, _jdumps(self._last_raw, pretty=True).decode('utf-8'))
+        self.raw_text.configure(state="disabled")
+        self._raw_dirty = False
+    
+    def extract_song_info(self, song: Dict) -> SongInfo:
         """从歌曲数据中提取信息"""
         # 获取歌曲ID
         song_id = song.get('id', 0)
@@ -551,14 +821,8 @@ class NeteaseSearchDownload:
         
         # 获取歌手信息
         artists_data = song.get('artists', [])
-        artist_names = []
-        artist_ids = []
-        
-        for artist in artists_data:
-            name = artist.get('name', '未知歌手')
-            artist_id = artist.get('id', 0)
-            artist_names.append(name)
-            artist_ids.append(str(artist_id))
+        artist_names = [artist.get('name', '未知歌手') for artist in artists_data]
+        artist_ids = [str(artist.get('id', 0)) for artist in artists_data]
         
         # 获取其他信息
         name = song.get('name', '未知歌曲')
@@ -566,58 +830,48 @@ class NeteaseSearchDownload:
         
         # 格式化时长
         if duration_ms:
-            total_seconds = duration_ms // 1000
-            minutes = total_seconds // 60
-            seconds = total_seconds % 60
+            minutes, seconds = divmod(duration_ms // 1000, 60)
             duration_str = f"{minutes}:{seconds:02d}"
         else:
             duration_str = "0:00"
         
-        # 发布时间
+        # 发布时间（毫秒时间戳，超出 1970~2100 范围视为无效）
         publish_time = album_data.get('publishTime', 0)
-        if publish_time:
-            try:
-                publish_str = datetime.fromtimestamp(publish_time/1000).strftime('%Y-%m-%d')
-            except:
-                publish_str = str(publish_time)
+        if isinstance(publish_time, int) and 0 < publish_time < 4102444800000:
+            publish_str = datetime.fromtimestamp(publish_time / 1000).strftime('%Y-%m-%d')
         else:
             publish_str = "未知"
         
         # 生成下载链接
         download_link = f"http://music.163.com/song/media/outer/url?id={song_id}.mp3"
         
-        return {
-            'song_id': song_id,
-            'name': name,
-            'artists': artist_names,
-            'artist_ids': artist_ids,
-            'artist_str': '/'.join(artist_names) if artist_names else '未知歌手',
-            'album_id': album_id,
-            'album_name': album_name,
-            'duration': duration_str,
-            'duration_ms': duration_ms,
-            'publish_time': publish_str,
-            'download_link': download_link,
-            'raw_data': song
-        }
+        return SongInfo(
+            song_id=song_id,
+            name=name,
+            artists=artist_names,
+            artist_ids=artist_ids,
+            artist_str='/'.join(artist_names) if artist_names else '未知歌手',
+            album_id=album_id,
+            album_name=album_name,
+            duration=duration_str,
+            duration_ms=duration_ms,
+            publish_time=publish_str,
+            download_link=download_link
+        )
     
     def generate_filename(self, song_name, artist):
         """根据命名设置生成文件名"""
         # 清理文件名中的非法字符
-        def clean_filename(text):
-            # 替换Windows文件名中不允许的字符
-            illegal_chars = r'<>:"/\\|?*'
-            for char in illegal_chars:
-                text = text.replace(char, '_')
-            return text.strip()
-        
-        clean_song_name = clean_filename(song_name)
-        clean_artist = clean_filename(artist)
+        clean_song_name = song_name.translate(self._FN_TRANS).strip()
+        clean_artist = artist.translate(self._FN_TRANS).strip()
         
         if self.naming_format == "歌曲名":
-            return f"{clean_song_name}.mp3"
+            stem = clean_song_name
         else:  # 歌曲名-歌手
-            return f"{clean_song_name} - {clean_artist}.mp3"
+            stem = f"{clean_song_name} - {clean_artist}"
+        # 文件系统按字节限制文件名长度（通常 255 字节），按 UTF-8 字节截断并丢弃被截断的半个字符
+        stem = stem.encode('utf-8')[:self._FN_MAX_BYTES].decode('utf-8', 'ignore')
+        return f"{stem.rstrip()}.mp3"
     
     def display_results(self, data: Dict):
         """显示搜索结果"""
@@ -625,10 +879,10 @@ class NeteaseSearchDownload:
             return
         
         # 清空树状视图和缓存
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
         
         self.song_details = []
+        self._raw_songs = []
         
         # 获取结果
         result = data.get('result', {})
@@ -645,22 +899,26 @@ class NeteaseSearchDownload:
             self.download_status_label.config(text="未找到歌曲")
             return
         
-        # 提取并显示歌曲信息
-        for i, song in enumerate(songs):
-            song_info = self.extract_song_info(song)
-            self.song_details.append(song_info)
-            
-            # 显示在树状视图中
-            self.tree.insert('', 'end', values=(
-                i + 1,
-                song_info['song_id'],
-                song_info['name'],
-                song_info['artist_str'],
-                song_info['album_name'],
-                song_info['duration'],
-                song_info['album_id'],
-                ','.join(song_info['artist_ids'])
-            ))
+        # 提取歌曲信息并预先生成每行数据
+        self.song_details = [self.extract_song_info(song) for song in songs]
+        self._raw_songs = songs
+        rows = [
+            (
+                i,
+                song_info.song_id,
+                song_info.name,
+                song_info.artist_str,
+                song_info.album_name,
+                song_info.duration,
+                song_info.album_id,
+                ','.join(song_info.artist_ids)
+            )
+            for i, song_info in enumerate(self.song_details, start=1)
+        ]
+        
+        # 显示在树状视图中（iid 即 song_details 中的索引）
+        for index, values in enumerate(rows):
+            self.tree.insert('', 'end', iid=str(index), values=values)
         
         # 更新状态
         song_count = result.get('songCount', len(songs))
@@ -678,7 +936,7 @@ class NeteaseSearchDownload:
         
         # 默认选中第一首歌
         if self.song_details:
-            self.tree.selection_set(self.tree.get_children()[0])
+            self.tree.selection_set('0')
             self.update_song_detail(0)
     
     def update_song_detail(self, index: int):
@@ -689,34 +947,34 @@ class NeteaseSearchDownload:
         song_info = self.song_details[index]
         
         # 更新显示
-        self.detail_name.config(text=song_info['name'])
-        self.detail_song_id.config(text=str(song_info['song_id']))
-        self.detail_artists.config(text=song_info['artist_str'])
-        self.detail_album.config(text=song_info['album_name'])
-        self.detail_album_id.config(text=str(song_info['album_id']))
-        self.detail_artist_ids.config(text=','.join(song_info['artist_ids']))
-        self.detail_duration.config(text=song_info['duration'])
-        self.detail_publish.config(text=song_info['publish_time'])
+        self.detail_name.config(text=song_info.name)
+        self.detail_song_id.config(text=str(song_info.song_id))
+        self.detail_artists.config(text=song_info.artist_str)
+        self.detail_album.config(text=song_info.album_name)
+        self.detail_album_id.config(text=str(song_info.album_id))
+        self.detail_artist_ids.config(text=','.join(song_info.artist_ids))
+        self.detail_duration.config(text=song_info.duration)
+        self.detail_publish.config(text=song_info.publish_time)
         
         # 显示下载链接
         self.detail_download_link.delete(1.0, tk.END)
-        self.detail_download_link.insert(tk.END, song_info['download_link'])
+        self.detail_download_link.insert(tk.END, song_info.download_link)
         
         # 重置下载状态
         self.detail_download_status.config(text="")
         
         # 存储选中的歌曲信息
         self.selected_song = {
-            'id': song_info['song_id'],
-            'name': song_info['name'],
-            'artist': song_info['artist_str'],
-            'download_link': song_info['download_link']
+            'id': song_info.song_id,
+            'name': song_info.name,
+            'artist': song_info.artist_str,
+            'download_link': song_info.download_link
         }
         
         # 启用下载和测试按钮
         self.download_btn.config(state="normal")
         self.test_download_btn.config(state="normal")
-        self.download_status_label.config(text=f"准备下载: {song_info['name']}")
+        self.download_status_label.config(text=f"准备下载: {song_info.name}")
     
     def on_song_selected(self, event):
         """歌曲选择事件"""
@@ -724,17 +982,25 @@ class NeteaseSearchDownload:
         if not selection:
             return
         
-        item = selection[0]
-        children = self.tree.get_children()
-        if item in children:
-            index = children.index(item)
-            self.update_song_detail(index)
-            
-            # 在状态栏显示选中信息
-            song_info = self.song_details[index]
-            self.status_label.config(
-                text=f"选中: {song_info['name']} - ID: {song_info['song_id']}"
-            )
+        # 连续切换选中（如按住方向键）时只在空闲时刷新一次，以最后一次为准
+        if self._pending_detail_idx is None:
+            self.root.after_idle(self._apply_detail_update)
+        self._pending_detail_idx = int(selection[0])
+    
+    def _apply_detail_update(self):
+        """刷新最后一次选中歌曲的详情"""
+        index = self._pending_detail_idx
+        self._pending_detail_idx = None
+        if index is None or index >= len(self.song_details):
+            return
+        
+        self.update_song_detail(index)
+        
+        # 在状态栏显示选中信息
+        song_info = self.song_details[index]
+        self.status_label.config(
+            text=f"选中: {song_info.name} - ID: {song_info.song_id}"
+        )
     
     def fetch_and_download_song(self, song_id, song_name=None, artist=None, download_link=None):
         """下载歌曲"""
@@ -745,38 +1011,87 @@ class NeteaseSearchDownload:
             
             self.log(f"下载链接: {download_link}", "DEBUG")
             
-            response = requests.get(download_link, allow_redirects=True, timeout=30)
-            
-            # 检查重定向后的最终URL是否为404页面
-            if response.url == "https://music.163.com/#/404":
-                return False, "无法下载歌曲，请检查ID是否正确"
-            
-            if response.status_code != 200:
-                return False, f"下载失败，状态码: {response.status_code}"
-            
-            # 创建下载目录
-            if not os.path.exists(self.download_dir):
-                os.makedirs(self.download_dir)
-            
-            # 生成文件名
-            if song_name and artist:
-                filename = self.generate_filename(song_name, artist)
+            # 上次中断的下载：带上 Range/If-Range 只请求缺失的部分
+            resume = self._resume_index.get(str(song_id))
+            headers = {}
+            if resume and os.path.isfile(resume['part_path']):
+                downloaded = os.path.getsize(resume['part_path'])
+                validator = resume.get('etag') or resume.get('last_modified')
+                if downloaded and validator:
+                    headers = {'Range': f"bytes={downloaded}-", 'If-Range': validator}
+                    self.log(f"继续下载: {resume['full_path']} (已下载 {downloaded} bytes)", "DEBUG")
             else:
-                filename = f"歌曲_{song_id}.mp3"
-            
-            # 保存文件
-            full_path = os.path.join(self.download_dir, filename)
-            
-            # 避免文件名重复
-            counter = 1
-            while os.path.exists(full_path):
-                base_name, ext = os.path.splitext(filename)
-                new_filename = f"{base_name} ({counter}){ext}"
-                full_path = os.path.join(self.download_dir, new_filename)
-                counter += 1
+                resume = None
             
-            with open(full_path, 'wb') as f:
-                f.write(response.content)
+            # 流式下载，避免把整首歌缓存在内存中
+            with self.session.get(download_link, allow_redirects=True, stream=True,
+                                  timeout=(5, 30), headers=headers) as response:
+                # 检查重定向后的最终URL是否为404页面
+                if response.url == "https://music.163.com/#/404":
+                    return False, "无法下载歌曲，请检查ID是否正确"
+                
+                if headers and response.status_code not in (200, 206):
+                    # 416 且临时文件大小与服务器文件一致：上次已下载完整，只是没来得及改名
+                    total = response.headers.get('Content-Range', '').rpartition('/')[2]
+                    if response.status_code == 416 and total == str(downloaded):
+                        os.replace(resume['part_path'], resume['full_path'])
+                        self.update_resume_index(song_id, None)
+                        return True, resume['full_path']
+                    # 其他情况无法续传：丢弃记录与临时文件，重新完整下载
+                    self.log(f"无法继续下载 (状态码: {response.status_code})，重新下载", "DEBUG")
+                    self.update_resume_index(song_id, None)
+                    try:
+                        os.remove(resume['part_path'])
+                    except OSError:
+                        pass
+                    return self.fetch_and_download_song(song_id, song_name, artist, download_link)
+                
+                if response.status_code not in (200, 206):
+                    return False, f"下载失败，状态码: {response.status_code}"
+                
+                if resume:
+                    full_path = resume['full_path']
+                    part_path = resume['part_path']
+                    # 206 表示服务器接受续传；200 表示文件已变化，需要重新下载
+                    mode = 'ab' if response.status_code == 206 else 'wb'
+                    f = open(part_path, mode, buffering=self._WRITE_BUFFER_SIZE)
+                else:
+                    # 生成文件名
+                    if song_name and artist:
+                        filename = self.generate_filename(song_name, artist)
+                    else:
+                        filename = f"歌曲_{song_id}.mp3"
+                    
+                    # 原子地占用 .part 临时文件名，避免并发下载重名；
+                    # 最终文件只在下载完成后由 os.replace 生成，中断时不会留下不完整的歌曲
+                    full_path, part_path, fd = self.create_unique_file(filename)
+                    f = os.fdopen(fd, 'wb', buffering=self._WRITE_BUFFER_SIZE)
+                
+                # 下载开始前登记临时文件：程序异常退出后可续传，启动清理也只处理登记过的文件
+                self.update_resume_index(song_id, {
+                    'full_path': os.path.abspath(full_path),
+                    'part_path': os.path.abspath(part_path),
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                })
+                
+                try:
+                    # iter_content 会把连接中断/读取超时转换为 requests 异常，便于保留已下载部分
+                    with f:
+                        for chunk in response.iter_content(self._COPY_CHUNK_SIZE):
+                            f.write(chunk)
+                    os.replace(part_path, full_path)
+                    self.update_resume_index(song_id, None)
+                except requests.exceptions.RequestException:
+                    # 网络中断：保留已下载的部分及登记记录，下次下载时续传
+                    raise
+                except BaseException:
+                    self.update_resume_index(song_id, None)
+                    try:
+                        os.remove(part_path)
+                    except OSError:
+                        pass
+                    raise
             
             return True, full_path
             
@@ -785,6 +1100,121 @@ class NeteaseSearchDownload:
         except Exception as e:
             return False, f"下载失败: {str(e)}"
     
+    def load_resume_index(self) -> Dict:
+        """加载断点续传记录，丢弃临时文件已不存在的记录"""
+        try:
+            with open(self._resume_file, "rb") as f:
+                index = _jloads(f.read())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"加载断点续传记录失败: {e}")
+            return {}
+        
+        if not isinstance(index, dict):
+            logger.warning("断点续传记录格式错误，已忽略")
+            return {}
+        
+        return {
+            song_id: entry for song_id, entry in index.items()
+            if isinstance(entry, dict)
+            and isinstance(entry.get('full_path'), str)
+            and isinstance(entry.get('part_path'), str)
+            and os.path.isfile(entry['part_path'])
+        }
+    
+    def update_resume_index(self, song_id, entry):
+        """更新（entry 为 None 时删除）断点续传记录，并原子地写回文件"""
+        key = str(song_id)
+        with self._resume_lock:
+            if entry is None:
+                if self._resume_index.pop(key, None) is None:
+                    return
+            else:
+                self._resume_index[key] = entry
+            self._write_resume_index()
+    
+    def _write_resume_index(self):
+        """原子地写回断点续传记录（调用方需持有 _resume_lock）"""
+        tmp_path = self._resume_file + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(_jdumps(self._resume_index, pretty=True))
+            os.replace(tmp_path, self._resume_file)
+        except OSError as e:
+            logger.warning(f"保存断点续传记录失败: {e}")
+    
+    def cleanup_partial_downloads(self, max_age: int = 7 * 24 * 3600):
+        """清理本程序登记过、且长时间未续传的 .mp3.part 文件
+        
+        只处理断点续传记录中的路径，不会删除其他程序（如浏览器）留在下载目录中的 .part 文件。
+        """
+        now = time.time()
+        with self._resume_lock:
+            stale = []
+            for song_id, entry in self._resume_index.items():
+                part_path = entry['part_path']
+                full_path = entry['full_path']
+                if not part_path.endswith(".mp3.part") or part_path != full_path + ".part":
+                    continue
+                try:
+                    if now - os.path.getmtime(part_path) < max_age:
+                        continue
+                    os.remove(part_path)
+                    stale.append(song_id)
+                    logger.info(f"已清理未完成的下载: {os.path.basename(part_path)}")
+                except OSError as e:
+                    logger.warning(f"清理未完成的下载失败: {os.path.basename(part_path)} ({e})")
+            
+            if stale:
+                for song_id in stale:
+                    del self._resume_index[song_id]
+                self._write_resume_index()
+    
+    def create_unique_file(self, filename):
+        """在下载目录中原子地创建 .part 临时文件，最终文件名与临时文件名都不能已存在，
+        重名时追加随机后缀，返回 (最终路径, 临时文件路径, 临时文件描述符)"""
+        flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0)
+        os.makedirs(self.download_dir, exist_ok=True)  # 运行期间目录可能被删除
+        full_path = os.path.join(self.download_dir, filename)
+        base_name, ext = os.path.splitext(full_path)
+        
+        for _ in range(5):
+            part_path = full_path + ".part"
+            try:
+                fd = os.open(part_path, flags, 0o644)
+            except FileExistsError:
+                pass
+            else:
+                # 占用临时文件后再检查最终文件：同名下载完成后其临时文件已不存在
+                if not os.path.exists(full_path):
+                    return full_path, part_path, fd
+                os.close(fd)
+                os.remove(part_path)
+            full_path = f"{base_name}_{secrets.token_hex(3)}{ext}"
+        
+        raise FileExistsError(f"无法创建不重复的文件: {filename}")
+    
+    def head_download_link(self, song_id, download_link):
+        """HEAD请求下载链接，返回 (状态码, 最终URL, 大小, 类型)，短时间内复用结果"""
+        cached = self._head_cache.get(song_id)
+        if cached and time.monotonic() - cached[4] < self._head_cache_ttl:
+            return cached[:4]
+        
+        response = self.session.head(download_link, allow_redirects=True, timeout=5)
+        if response.status_code == 405:
+            # 服务器不支持HEAD时改用流式GET，只读取响应头
+            response = self.session.get(download_link, allow_redirects=True, stream=True, timeout=5)
+            response.close()
+        result = (
+            response.status_code,
+            response.url,
+            response.headers.get('content-length', '未知'),
+            response.headers.get('content-type', '未知')
+        )
+        self._head_cache[song_id] = result + (time.monotonic(),)
+        return result
+    
     def download_selected_song(self):
         """下载选中的歌曲"""
         if not self.selected_song:
@@ -833,18 +1263,17 @@ class NeteaseSearchDownload:
         try:
             self.detail_download_status.config(text="正在测试链接...", foreground="blue")
             
-            response = requests.head(download_link, allow_redirects=True, timeout=10)
+            status_code, final_url, content_length, content_type = self.head_download_link(
+                self.selected_song['id'], download_link
+            )
             
-            if response.status_code == 200:
-                content_length = response.headers.get('content-length', '未知')
-                content_type = response.headers.get('content-type', '未知')
-                
+            if status_code == 200:
                 self.detail_download_status.config(
                     text=f"✅ 链接有效 | 大小: {content_length} bytes | 类型: {content_type}",
                     foreground="green"
                 )
                 self.log(f"链接测试成功: {download_link}")
-            elif response.url == "https://music.163.com/#/404":
+            elif final_url == "https://music.163.com/#/404":
                 self.detail_download_status.config(
                     text="❌ 链接指向404页面（可能没有下载权限）",
                     foreground="red"
@@ -852,10 +1281,10 @@ class NeteaseSearchDownload:
                 self.log(f"链接测试失败: 指向404页面", "WARNING")
             else:
                 self.detail_download_status.config(
-                    text=f"❌ 链接测试失败: HTTP {response.status_code}",
+                    text=f"❌ 链接测试失败: HTTP {status_code}",
                     foreground="red"
                 )
-                self.log(f"链接测试失败: HTTP {response.status_code}", "WARNING")
+                self.log(f"链接测试失败: HTTP {status_code}", "WARNING")
                 
         except Exception as e:
             self.detail_download_status.config(
@@ -894,40 +1323,40 @@ class NeteaseSearchDownload:
         success_count = 0
         fail_count = 0
         
-        self.root.after(0, lambda: self.status_label.config(text=f"批量下载中... 0/{total}"))
-        
-        for i, song_info in enumerate(songs_info):
-            song_id = song_info['song_id']
-            song_name = song_info['name']
-            artist = song_info['artist_str']
-            download_link = song_info['download_link']
-            
-            # 更新状态
-            self.root.after(0, lambda idx=i: self.status_label.config(
-                text=f"批量下载中... {idx+1}/{total}"
-            ))
-            
-            # 下载歌曲
-            success, result = self.fetch_and_download_song(song_id, song_name, artist, download_link)
+        self._ui_queue.put_nowait(('status', f"批量下载中... 0/{total}"))
+        
+        # 并发下载（网络IO为主，线程池可显著缩短总耗时）
+        with ThreadPoolExecutor(max_workers=self.batch_concurrency) as executor:
+            futures = {
+                executor.submit(
+                    self.fetch_and_download_song,
+                    song_info.song_id,
+                    song_info.name,
+                    song_info.artist_str,
+                    song_info.download_link
+                ): song_info
+                for song_info in songs_info
+            }
             
-            if success:
-                success_count += 1
-                self.root.after(0, lambda name=song_name, artist=artist: self.add_download_log(
-                    f"✅ 下载成功: {name} - {artist}"
-                ))
-            else:
-                fail_count += 1
-                self.root.after(0, lambda name=song_name, artist=artist, err=result: self.add_download_log(
-                    f"❌ 下载失败: {name} - {artist} ({err})"
-                ))
+            for done, future in enumerate(as_completed(futures), start=1):
+                song_info = futures[future]
+                song_name = song_info.name
+                artist = song_info.artist_str
+                success, result = future.result()
+                
+                if success:
+                    success_count += 1
+                    self._ui_queue.put_nowait(('log', f"✅ 下载成功: {song_name} - {artist}"))
+                else:
+                    fail_count += 1
+                    self._ui_queue.put_nowait(('log', f"❌ 下载失败: {song_name} - {artist} ({result})"))
+                
+                # 更新状态
+                self._ui_queue.put_nowait(('status', f"批量下载中... {done}/{total}"))
         
         # 显示结果
-        self.root.after(0, lambda: self.status_label.config(
-            text=f"批量下载完成: 成功 {success_count} 首，失败 {fail_count} 首"
-        ))
-        self.root.after(0, lambda: self.add_download_log(
-            f"批量下载完成: 共 {total} 首，成功 {success_count} 首，失败 {fail_count} 首"
-        ))
+        self._ui_queue.put_nowait(('status', f"批量下载完成: 成功 {success_count} 首，失败 {fail_count} 首"))
+        self._ui_queue.put_nowait(('log', f"批量下载完成: 共 {total} 首，成功 {success_count} 首，失败 {fail_count} 首"))
         
         if fail_count == 0:
             self.root.after(0, lambda: messagebox.showinfo(
@@ -942,23 +1371,25 @@ class NeteaseSearchDownload:
     
     def open_download_folder(self):
         """打开下载文件夹"""
-        if not os.path.exists(self.download_dir):
-            os.makedirs(self.download_dir)
+        os.makedirs(self.download_dir, exist_ok=True)
         
         try:
             # Windows
             if os.name == 'nt':
                 os.startfile(self.download_dir)
-            # MacOS
-            elif os.name == 'posix':
-                import subprocess
-                subprocess.call(['open', self.download_dir])
-            # Linux
             else:
                 import subprocess
-                subprocess.call(['xdg-open', self.download_dir])
+                import sys
+                # MacOS 使用 open，Linux 使用 xdg-open；不等待子进程，避免阻塞界面
+                opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+                subprocess.Popen(
+                    [opener, self.download_dir],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True
+                )
             
-            self.log(f"打开下载文件夹: {os.path.abspath(self.download_dir)}")
+            self.log(f"打开下载文件夹: {self._download_dir_abs}")
         except Exception as e:
             messagebox.showerror("打开失败", f"无法打开文件夹:\n{str(e)}")
     
@@ -977,13 +1408,13 @@ class NeteaseSearchDownload:
         # 标题
         tk.Label(naming_win, 
                  text="歌曲命名设置", 
-                 font=("Microsoft YaHei", 14, "bold"), 
+                 font=self.fonts['title'], 
                  bg='white').pack(pady=20)
         
         # 命名格式选项
         tk.Label(naming_win, 
                  text="选择文件命名格式:", 
-                 font=("Microsoft YaHei", 11), 
+                 font=self.fonts['label'], 
                  bg='white').pack(pady=10)
         
         # 单选按钮
@@ -996,20 +1427,20 @@ class NeteaseSearchDownload:
                       text="歌曲名 (如: 一路生花.mp3)", 
                       variable=naming_var, 
                       value="歌曲名",
-                      font=("Microsoft YaHei", 10),
+                      font=self.fonts['body'],
                       bg='white').pack(anchor='w', pady=5)
         
         tk.Radiobutton(format_frame, 
                       text="歌曲名-歌手 (如: 一路生花 - 刘宇宁.mp3)", 
                       variable=naming_var, 
                       value="歌曲名-歌手",
-                      font=("Microsoft YaHei", 10),
+                      font=self.fonts['body'],
                       bg='white').pack(anchor='w', pady=5)
         
         # 示例显示
         example_label = tk.Label(naming_win, 
                                 text="示例: 一路生花 - 刘宇宁.mp3", 
-                                font=("Microsoft YaHei", 10), 
+                                font=self.fonts['body'], 
                                 fg='gray',
                                 bg='white')
         example_label.pack(pady=10)
@@ -1028,7 +1459,7 @@ class NeteaseSearchDownload:
         
         def save_naming_settings():
             self.naming_format = naming_var.get()
-            self.save_settings()
+            self._schedule_save()
             self.log(f"歌曲命名格式已设置为: {self.naming_format}")
             naming_win.destroy()
         
@@ -1062,18 +1493,18 @@ class NeteaseSearchDownload:
         # 标题
         tk.Label(location_win, 
                  text="下载位置设置", 
-                 font=("Microsoft YaHei", 14, "bold"), 
+                 font=self.fonts['title'], 
                  bg='white').pack(pady=20)
         
         # 当前位置显示
         tk.Label(location_win, 
                  text="当前下载位置:", 
-                 font=("Microsoft YaHei", 11), 
+                 font=self.fonts['label'], 
                  bg='white').pack(pady=5)
         
         current_location = tk.Label(location_win, 
-                                   text=os.path.abspath(self.download_dir),
-                                   font=("Microsoft YaHei", 10),
+                                   text=self._download_dir_abs,
+                                   font=self.fonts['body'],
                                    fg='blue',
                                    bg='white',
                                    wraplength=400)
@@ -1082,7 +1513,7 @@ class NeteaseSearchDownload:
         # 设置新位置
         tk.Label(location_win, 
                  text="设置新位置:", 
-                 font=("Microsoft YaHei", 11), 
+                 font=self.fonts['label'], 
                  bg='white').pack(pady=15)
         
         # 输入框和浏览按钮
@@ -1094,7 +1525,7 @@ class NeteaseSearchDownload:
         location_entry = tk.Entry(location_frame, 
                                  textvariable=location_var,
                                  width=40,
-                                 font=("Microsoft YaHei", 10))
+                                 font=self.fonts['body'])
         location_entry.pack(side='left', padx=(0, 10))
         
         def browse_folder():
@@ -1124,33 +1555,27 @@ class NeteaseSearchDownload:
             # 检查路径是否有效
             try:
                 # 尝试创建目录
-                if not os.path.exists(new_location):
-                    try:
-                        os.makedirs(new_location)
-                    except:
-                        messagebox.showerror("路径错误", "无法创建指定的目录，请检查路径是否有写权限。")
-                        return
+                try:
+                    os.makedirs(new_location, exist_ok=True)
+                except OSError:
+                    messagebox.showerror("路径错误", "无法创建指定的目录，请检查路径是否有写权限。")
+                    return
                 
                 # 检查目录是否可写
-                test_file = os.path.join(new_location, "test_write.tmp")
-                try:
-                    with open(test_file, 'w') as f:
-                        f.write("test")
-                    os.remove(test_file)
-                except:
+                if not os.access(new_location, os.W_OK):
                     messagebox.showerror("权限错误", "无法写入到指定目录，请检查目录权限。")
                     return
                 
                 # 保存设置
                 self.download_dir = new_location
-                self.save_settings()
+                self._schedule_save()
                 
                 # 更新界面显示
                 self.download_location_label.config(
                     text=f"下载位置: {self.download_dir}"
                 )
                 
-                self.log(f"下载位置已设置为: {os.path.abspath(self.download_dir)}")
+                self.log(f"下载位置已设置为: {self._download_dir_abs}")
                 location_win.destroy()
                 
             except Exception as e:
@@ -1180,6 +1605,9 @@ class NeteaseSearchDownload:
     
     def on_search(self):
         """搜索按钮点击事件"""
+        if self._search_inflight:
+            return
+        
         keywords = self.keyword_var.get().strip()
         if not keywords:
             messagebox.showwarning("输入错误", "请输入搜索关键词")
@@ -1197,22 +1625,72 @@ class NeteaseSearchDownload:
             self.current_offset = offset_int
             self.current_limit = limit_int
             
-            # 在新线程中执行搜索
-            thread = threading.Thread(
-                target=self._do_search,
-                args=(keywords, offset, limit)
-            )
-            thread.daemon = True
-            thread.start()
+            # 交给搜索线程执行，完成前禁用搜索按钮
+            self._search_inflight = True
+            self.search_btn.config(state="disabled")
+            self.submit_search(keywords, offset_int, limit_int, use_cache=False, user_search=True)
             
         except ValueError:
             messagebox.showwarning("输入错误", "请输入有效的数字")
     
-    def _do_search(self, keywords: str, offset: str, limit: str):
-        """执行搜索"""
-        data = self.search_music(keywords, offset, limit)
-        if data:
-            self.root.after(0, lambda: self.display_results(data))
+    def submit_search(self, keywords: str, offset: int, limit: int, use_cache: bool = True,
+                      user_search: bool = False):
+        """提交搜索请求，丢弃尚未开始的旧请求
+        
+        user_search 表示由搜索按钮发起（已设置 _search_inflight），完成后需恢复搜索按钮。
+        """
+        try:
+            dropped = self._search_q.get_nowait()
+            # 被替换的是按钮发起的搜索时，由新请求负责在完成后恢复按钮
+            user_search = user_search or dropped[4]
+        except queue.Empty:
+            pass
+        self._search_q.put_nowait((keywords, offset, limit, use_cache, user_search))
+    
+    def _search_worker(self):
+        """搜索线程：依次处理搜索请求"""
+        while True:
+            keywords, offset, limit, use_cache, user_search = self._search_q.get()
+            try:
+                self._do_search(keywords, offset, limit, use_cache)
+            except Exception as e:
+                logger.error(f"搜索线程异常: {e}", exc_info=True)
+            finally:
+                if user_search:
+                    self.root.after(0, self._on_search_finished)
+    
+    def _on_search_finished(self):
+        """搜索完成后恢复搜索按钮"""
+        self._search_inflight = False
+        self.search_btn.config(state="normal")
+    
+    def _do_search(self, keywords: str, offset: int, limit: int, use_cache: bool = True):
+        """执行搜索（翻页时优先使用缓存的结果）"""
+        key = (keywords, offset, limit)
+        data = self._search_cache.get(key) if use_cache else None
+        
+        if data is not None:
+            self._search_cache.move_to_end(key)
+            self.log(f"使用缓存的搜索结果: '{keywords}' (offset={offset}, limit={limit})", "DEBUG")
+        else:
+            data = self.search_music(keywords, offset, limit)
+            if not data:
+                return
+            
+            self._search_cache[key] = data
+            self._search_cache.move_to_end(key)
+            if len(self._search_cache) > self._search_cache_size:
+                self._search_cache.popitem(last=False)
+        
+        self.root.after(0, lambda: self._apply_search_result(data))
+    
+    def _apply_search_result(self, data):
+        """在主线程中记录原始数据并显示搜索结果"""
+        # 记录原始数据，等到查看时再格式化；只在主线程读写，避免与 refresh_raw_data 竞争
+        self._last_raw = data
+        self._raw_dirty = True
+        self.refresh_raw_data()
+        self.display_results(data)
     
     def prev_page(self):
         """上一页"""
@@ -1222,14 +1700,14 @@ class NeteaseSearchDownload:
         new_offset = max(0, self.current_offset - self.current_limit)
         self.offset_var.set(str(new_offset))
         self.current_offset = new_offset
-        self._do_search(self.current_keywords, str(new_offset), str(self.current_limit))
+        self.submit_search(self.current_keywords, new_offset, self.current_limit)
     
     def next_page(self):
         """下一页"""
         new_offset = self.current_offset + self.current_limit
         self.offset_var.set(str(new_offset))
         self.current_offset = new_offset
-        self._do_search(self.current_keywords, str(new_offset), str(self.current_limit))
+        self.submit_search(self.current_keywords, new_offset, self.current_limit)
     
     def goto_offset(self):
         """跳转到指定偏移量"""
@@ -1244,7 +1722,7 @@ class NeteaseSearchDownload:
             
             self.offset_var.set(str(offset))
             self.current_offset = offset
-            self._do_search(self.current_keywords, str(offset), str(self.current_limit))
+            self.submit_search(self.current_keywords, offset, self.current_limit)
             
         except ValueError:
             messagebox.showwarning("输入错误", "请输入有效的数字偏移量")
@@ -1255,12 +1733,14 @@ class NeteaseSearchDownload:
         self.offset_var.set("0")
         self.goto_var.set("")
         
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
         
-        self.raw_text.delete(1.0, tk.END)
-        self.log_text.delete(1.0, tk.END)
-        self.download_log_text.delete(1.0, tk.END)
+        with self._text_lock:
+            self._text_buffers.clear()
+        for widget in (self.raw_text, self.log_text, self.download_log_text):
+            widget.configure(state="normal")
+            widget.delete(1.0, tk.END)
+            widget.configure(state="disabled")
         
         self.detail_name.config(text="")
         self.detail_song_id.config(text="")
@@ -1285,7 +1765,10 @@ class NeteaseSearchDownload:
         self.current_offset = 0
         self.current_result = None
         self.song_details = []
+        self._raw_songs = []
         self.selected_song = None
+        self._last_raw = None
+        self._raw_dirty = False
         
         self.log("搜索状态已重置")
         self.status_label.config(text="就绪")
@@ -1309,7 +1792,7 @@ class NeteaseSearchDownload:
         
         tk.Label(title_frame, 
                  text="网易云音乐搜索下载工具", 
-                 font=("Microsoft YaHei", 14, "bold"), 
+                 font=self.fonts['title'], 
                  bg='#0078D7', 
                  fg='white').pack(pady=15)
         
@@ -1320,25 +1803,25 @@ class NeteaseSearchDownload:
         # 版本信息
         tk.Label(content_frame, 
                  text="版本 4.0", 
-                 font=("Microsoft YaHei", 12), 
+                 font=self.fonts['heading'], 
                  bg='white').pack(pady=(0, 10))
         
         # 功能说明
         tk.Label(content_frame, 
                  text="功能：搜索 + 下载 一体化", 
-                 font=("Microsoft YaHei", 10), 
+                 font=self.fonts['body'], 
                  bg='white').pack(pady=5)
         
         # 版权信息
         tk.Label(content_frame, 
                  text="© 2025 文宇香香工作室 版权所有", 
-                 font=("Microsoft YaHei", 9), 
+                 font=self.fonts['small'], 
                  bg='white').pack(pady=5)
         
         # 作者信息
         tk.Label(content_frame, 
                  text="开发者：文宇香香", 
-                 font=("Microsoft YaHei", 10), 
+                 font=self.fonts['body'], 
                  bg='white').pack(pady=5)
         
         # 网站链接（可点击）
@@ -1347,12 +1830,12 @@ class NeteaseSearchDownload:
         
         tk.Label(link_frame, 
                  text="B站主页：", 
-                 font=("Microsoft YaHei", 9), 
+                 font=self.fonts['small'], 
                  bg='white').pack(side='left')
         
         link_label = tk.Label(link_frame, 
                              text="https://space.bilibili.com/3461564273265329", 
-                             font=("Microsoft YaHei", 9), 
+                             font=self.fonts['small'], 
                              fg='blue', 
                              bg='white',
                              cursor="hand2")
@@ -1377,7 +1860,11 @@ class NeteaseSearchDownload:
             print("如果觉得这个脚本好用的话就给作者个关注吧！求求啦！！！")
             print("作者B站主页：https://space.bilibili.com/3461564273265329")
             self.log("程序关闭")
+            if self._save_job:
+                self._flush_settings()
             self.root.destroy()
+            self.session.close()
+            stop_logging()
     
     def run(self):
         """运行程序"""